@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+
+from michigrad.nn import MLP
+from michigrad.serve import BatchingServer, percentile
+
+
+async def request(reader, writer, method, target, payload=None):
+    """ Sends one HTTP request over a keep-alive connection and returns the decoded JSON response. """
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    await reader.readline()  # status line
+    headers = {}
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode().partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return json.loads(await reader.readexactly(int(headers['content-length'])))
+
+
+async def connect(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection('127.0.0.1', args.port)
+
+
+async def client(args, n_requests, latencies):
+    # Each client sends its requests one after the other on its own connection
+    reader, writer = await connect(args)
+    for _ in range(n_requests):
+        x = [random.uniform(-1, 1) for _ in range(args.nin)]
+        t0 = time.perf_counter()
+        await request(reader, writer, 'POST', '/predict', {'x': x})
+        latencies.append(time.perf_counter() - t0)
+    writer.close()
+
+
+async def run(args, max_batch_size):
+    random.seed(0)
+    server = BatchingServer(MLP(args.nin, [16, 16, 1]), max_batch_size=max_batch_size, max_wait_ms=args.max_wait_ms)
+    http = await server.listen('127.0.0.1', 0, path=args.unix)
+    if not args.unix:
+        args.port = http.sockets[0].getsockname()[1]
+
+    latencies = []
+    per_client = args.requests // args.concurrency
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(args, per_client, latencies) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    reader, writer = await connect(args)
+    metrics = await request(reader, writer, 'GET', '/metrics')
+    writer.close()
+    http.close()
+    await http.wait_closed()
+    await server.stop()
+
+    print(f"max_batch_size={max_batch_size}: {len(latencies) / elapsed:.0f} req/s, "
+          f"client latency p50 {percentile(latencies, 50) * 1000:.2f} ms, p99 {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"  server metrics: {metrics}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the michigrad batching server, on localhost only.")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.)
+    parser.add_argument('--nin', type=int, default=8)
+    parser.add_argument('--unix', action='store_true', help="use a Unix socket instead of TCP")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        args.unix = os.path.join(tmp, 'michigrad.sock') if args.unix else None
+        # One request per model call vs. dynamic batching
+        for max_batch_size in (1, args.max_batch_size):
+            asyncio.run(run(args, max_batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,12 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from michigrad.engine import Value
-from michigrad.nn import Sequential, Linear, ReLU, Sigmoid, MLP
+from michigrad.nn import Sequential, Linear, ReLU, Sigmoid, MLP, Trainer
 
 def test_xor_michigrad():
     print("--- Michigrad XOR Training (Modular) ---")
     
-    # Inputs
+    # Inputs (plain Values: requires_grad is False, so backward skips them)
     X = [
         [Value(0.0), Value(0.0)],
         [Value(0.0), Value(1.0)],
@@ -30,32 +30,10 @@ def test_xor_michigrad():
     print(model)
 
     # Training Loop
-    lr = 0.5
-    for epoch in range(500):
-        total_loss = Value(0.0)
-        
-        for k in range(4):
-            # Forward pass
-            out = model(X[k])
-            gt = y[k]
-
-            pred = out
-            
-            loss = (pred - gt)**2
-            total_loss += loss
-        
-        # Reset gradients
-        model.zero_grad()
-        
-        # Backward pass
-        total_loss.backward()
-        
-        # Update
-        for p in model.parameters():
-            p.data -= lr * p.grad
-            
-        if epoch % 50 == 0:
-            print(f"Epoch {epoch}, Loss: {total_loss.data:.4f}")
+    # The Trainer backpropagates one microbatch graph at a time and accumulates the
+    # gradients, so the update is the same as with a single total_loss graph
+    trainer = Trainer(model, loss_fn=lambda pred, gt: (pred - gt)**2, lr=0.5, microbatch_size=2)
+    trainer.fit(X, y, epochs=500, log_every=50)
 
     # Predictions
     print("\nFinal Predictions:")
@@ -6,10 +6,13 @@ class Value:
     in a computational graph for backpropagation.
     """
 
-    def __init__(self, data, _children=(), _op='', name=''):
+    def __init__(self, data, _children=(), _op='', name='', requires_grad=False):
         self.data = data
         self.grad = 0  # Represents the derivative of the output with respect to this node
         self.name = name
+        # Only nodes that depend on a requires_grad leaf (e.g. nn parameters) take part in backward.
+        # Inputs, targets and constants don't, so no gradient rule is attached to them.
+        self.requires_grad = requires_grad or any(child.requires_grad for child in _children)
         
         # Internal variables for autograd graph construction
         self._backward = lambda: None  # Function to propagate gradients to children
@@ -22,9 +25,12 @@ class Value:
 
         def _backward():
             # Addition rule: gradients are distributed equally to both terms (local derivative is 1.0)
-            self.grad += out.grad
-            other.grad += out.grad
-        out._backward = _backward
+            if self.requires_grad:
+                self.grad += out.grad
+            if other.requires_grad:
+                other.grad += out.grad
+        if out.requires_grad:
+            out._backward = _backward
 
         return out
 
@@ -34,9 +40,12 @@ class Value:
 
         def _backward():
             # Product rule: derivative is the value of the other node scaled by the upstream gradient
-            self.grad += other.data * out.grad
-            other.grad += self.data * out.grad
-        out._backward = _backward
+            if self.requires_grad:
+                self.grad += other.data * out.grad
+            if other.requires_grad:
+                other.grad += self.data * out.grad
+        if out.requires_grad:
+            out._backward = _backward
 
         return out
 
@@ -47,7 +56,8 @@ class Value:
         def _backward():
             # Power rule: d/dx [x^n] = n * x^(n-1)
             self.grad += (other * (self.data**(other - 1))) * out.grad
-        out._backward = _backward
+        if out.requires_grad:
+            out._backward = _backward
 
         return out
 
@@ -57,7 +67,8 @@ class Value:
         def _backward():
             # ReLU derivative: 1 if x > 0, else 0 (at 0, it's technically undefined, but usually set to 0)
             self.grad += (out.data > 0) * out.grad
-        out._backward = _backward
+        if out.requires_grad:
+            out._backward = _backward
 
         return out
 
@@ -68,7 +79,8 @@ class Value:
         def _backward():
             # Exponential derivative: d/dx [e^x] = e^x
             self.grad += out.data * out.grad
-        out._backward = _backward
+        if out.requires_grad:
+            out._backward = _backward
 
         return out
 
@@ -81,7 +93,8 @@ class Value:
         def _backward():
             # Tanh derivative: d/dx [tanh(x)] = 1 - tanh(x)^2
             self.grad += (1 - t**2) * out.grad
-        out._backward = _backward
+        if out.requires_grad:
+            out._backward = _backward
 
         return out
 
@@ -115,7 +128,8 @@ class Value:
             def _backward():
                 # The gradient is 1 if the input was positive, 0 otherwise
                 self.grad += (out.data > 0) * out.grad
-            out._backward = _backward
+            if out.requires_grad:
+                out._backward = _backward
 
             return out
 
@@ -134,7 +148,8 @@ class Value:
                 # Chain rule: local_derivative * upstream_gradient
                 local_derivative = out.data * (1 - out.data)
                 self.grad += local_derivative * out.grad
-            out._backward = _backward
+            if out.requires_grad:
+                out._backward = _backward
 
             return out
 
@@ -154,17 +169,18 @@ class Value:
             def _backward():
                 # Gradient for the base (Power Rule): d/dx [x^n] = n * x^(n-1)
                 # We add a safety check for self.data == 0 if the exponent is less than 1
-                if self.data != 0:
+                if self.requires_grad and self.data != 0:
                     self.grad += (other_data * (self.data**(other_data - 1))) * out.grad
                 
                 # Gradient for the exponent (Exponential Rule): d/dy [a^y] = a^y * ln(a)
                 # This only applies if 'other' is a Value node in the graph
-                if is_value:
+                if is_value and other.requires_grad:
                     # Logarithm is only defined for positive bases
                     if self.data > 0:
                         other.grad += (out.data * math.log(self.data)) * out.grad
             
-            out._backward = _backward
+            if out.requires_grad:
+                out._backward = _backward
             return out
 
 
@@ -178,12 +194,25 @@ class Value:
 
 
 
-    def backward(self):
+    def backward(self, retain_graph=True):
         """
         Executes backpropagation starting from this node. 
         Constructs a topological sort of the graph to ensure the chain rule 
         is applied in the correct order (from output back to inputs).
+        Branches that don't lead to a requires_grad leaf are skipped.
+        
+        Args:
+            retain_graph: If False, the graph is taken apart after the backward pass
+                (closures and links to children are dropped) so its memory is freed right away.
         """
+        if not self.requires_grad:
+            # Without this, backward would silently leave every gradient at 0
+            raise RuntimeError(
+                f"backward() called on {self!r}, which does not depend on any Value with "
+                "requires_grad=True. Create the leaves you want gradients for (e.g. the weights) "
+                "with Value(..., requires_grad=True)."
+            )
+
         topo = []
         visited = set()
         
@@ -191,7 +220,8 @@ class Value:
             if v not in visited:
                 visited.add(v)
                 for child in v._prev:
-                    build_topo(child)
+                    if child.requires_grad:
+                        build_topo(child)
                 topo.append(v)
         
         build_topo(self)
@@ -202,6 +232,13 @@ class Value:
         for v in reversed(topo):
             v._backward()
 
+        if not retain_graph:
+            # The closures reference their own output node, so without this
+            # the graph would only be freed by the garbage collector
+            for v in topo:
+                v._backward = lambda: None
+                v._prev = set()
+
     # --- Utility Methods for Arithmetic Flexibility ---
 
     def __neg__(self): # -self
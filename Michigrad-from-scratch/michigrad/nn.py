@@ -1,6 +1,12 @@
 import random
+import time
 from michigrad.engine import Value
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to freeze() models for inference
+    np = None
+
 
 # =============================================================================
 # IMPLEMENTATION EXERCISES (MICHIGRAD)
@@ -54,6 +60,74 @@ class Module:
     def parameters(self):
         return []
 
+    def freeze(self):
+        """
+        Compiles the module into a graph-free FrozenModule for inference.
+        
+        The current weights are copied into NumPy arrays, so the result is not
+        affected by further training of the module.
+        """
+        if np is None:
+            raise ImportError("freeze() requires numpy")
+        return FrozenModule(self._compile(), repr(self), self._nin())
+
+    def _compile(self):
+        """ Returns a function mapping a (N, nin) NumPy batch to the (N, nout) outputs. """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support freeze()")
+
+    def _nin(self):
+        """ Number of inputs the module expects, or None if any size works (activations). """
+        return None
+
+
+class FrozenModule:
+    """
+    Inference-only version of a trained module, created with `Module.freeze()`.
+    
+    Runs whole batches as dense NumPy operations instead of building
+    a Value graph for every sample.
+    """
+
+    def __init__(self, forward, name, nin=None):
+        self._forward = forward
+        self.name = name
+        self.nin = nin
+
+    def predict_batch(self, X):
+        """
+        Args:
+            X: Batch of inputs, array-like of floats with shape (N, nin).
+        
+        Returns:
+            NumPy array with shape (N, nout), or (N,) for single output models,
+            so each row matches `model(x)` of the original module.
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2:
+            raise ValueError(f"expected a batch with shape (N, nin), got shape {X.shape}")
+        if self.nin is not None and X.shape[1] != self.nin:
+            raise ValueError(f"expected {self.nin} inputs per sample, got {X.shape[1]}")
+        out = self._forward(X)
+        return out[:, 0] if out.shape[1] == 1 else out
+
+    def __call__(self, x):
+        return self.predict_batch([x])[0]
+
+    def __repr__(self):
+        return f"FrozenModule({self.name})"
+
+
+def _compile_neurons(neurons):
+    """ Stacks the weights of a list of neurons into a single dense layer. """
+    W = np.array([[wi.data for wi in n.w] for n in neurons], dtype=float)  # (nout, nin)
+    b = np.array([n.b.data if n.b else 0. for n in neurons], dtype=float)
+    nonlin = np.array([n.nonlin for n in neurons])
+
+    def forward(X):
+        out = X @ W.T + b
+        return np.where(nonlin, np.maximum(out, 0.), out) if nonlin.any() else out
+    return forward
+
 class Neuron(Module):
 
     def __init__(self, nin, nonlin=True, bias=True):
@@ -64,8 +138,8 @@ class Neuron(Module):
             nin: Number of input connections (dimensionality of input vector).
             nonlin: If True, applies ReLU activation. If False, remains linear.
         """
-        self.w = [Value(random.uniform(-1,1)) for _ in range(nin)]
-        self.b = Value(0) if bias else None
+        self.w = [Value(random.uniform(-1,1), requires_grad=True) for _ in range(nin)]
+        self.b = Value(0, requires_grad=True) if bias else None
         self.nonlin = nonlin
 
     def __call__(self, x):
@@ -78,6 +152,12 @@ class Neuron(Module):
     def parameters(self):
         return self.w + ([self.b] if self.b else [])
 
+    def _compile(self):
+        return _compile_neurons([self])
+
+    def _nin(self):
+        return len(self.w)
+
     def __repr__(self):
         return f"{'ReLU' if self.nonlin else 'Linear'}Neuron({len(self.w)})"
 
@@ -104,6 +184,12 @@ class Linear(Module):
     def parameters(self):
         return [p for n in self.neurons for p in n.parameters()]
 
+    def _compile(self):
+        return _compile_neurons(self.neurons)
+
+    def _nin(self):
+        return len(self.neurons[0].w)
+
     def __repr__(self):
         return f"Linear({len(self.neurons[0].w)}, {len(self.neurons)})"
 
@@ -121,6 +207,9 @@ class ReLU(Module):
         # Handle single Value (single neuron output)
         return x.relu()
 
+    def _compile(self):
+        return lambda X: np.maximum(X, 0.)
+
     def __repr__(self):
         return "ReLU()"
 
@@ -133,6 +222,9 @@ class Tanh(Module):
             return [val.tanh() for val in x]
         return x.tanh()
 
+    def _compile(self):
+        return np.tanh
+
     def __repr__(self):
         return "Tanh()"
 
@@ -145,6 +237,12 @@ class Sigmoid(Module):
             return [val.sigmoid() for val in x]
         return x.sigmoid()
 
+    def _compile(self):
+        def forward(X):
+            with np.errstate(over='ignore'):  # exp(-x) -> inf just gives 0
+                return 1 / (1 + np.exp(-X))
+        return forward
+
     def __repr__(self):
         return "Sigmoid()"
 
@@ -170,6 +268,18 @@ class Sequential(Module):
     def parameters(self):
         return [p for layer in self.layers for p in layer.parameters()]
 
+    def _compile(self):
+        steps = [layer._compile() for layer in self.layers]
+
+        def forward(X):
+            for step in steps:
+                X = step(X)
+            return X
+        return forward
+
+    def _nin(self):
+        return next((layer._nin() for layer in self.layers if layer._nin() is not None), None)
+
     def __repr__(self):
         layers_str = ", ".join(str(layer) for layer in self.layers)
         return f"Sequential([{layers_str}])"
@@ -204,10 +314,91 @@ class MLP(Module):
     def parameters(self):
         return self.model.parameters()
 
+    def _compile(self):
+        return self.model._compile()
+
+    def _nin(self):
+        return self.model._nin()
+
     def __repr__(self):
         return f"MLP({self.model})"
 
 
 
 
-        
\ No newline at end of file
+        
+
+
+class Trainer:
+    """
+    Gradient descent training loop with microbatch gradient accumulation.
+    
+    Instead of building a single loss graph for the whole batch, each microbatch
+    is run forward and backward on its own and its graph is discarded before the next one.
+    The gradients add up in the parameters, so the update is the same as with one big graph,
+    but the graph size is bounded by `microbatch_size` instead of the batch size.
+    """
+
+    def __init__(self, model, loss_fn, lr=0.1, microbatch_size=32):
+        """
+        Args:
+            model: Module to train.
+            loss_fn: Function (prediction, target) -> Value with the loss of a single sample.
+                The loss of a batch is the sum over its samples.
+            lr: Learning rate.
+            microbatch_size: Number of samples in each graph.
+        """
+        self.model = model
+        self.loss_fn = loss_fn
+        self.lr = lr
+        self.microbatch_size = microbatch_size
+
+    def accumulate(self, X, y):
+        """
+        Runs forward and backward over the samples one microbatch at a time,
+        adding the gradients into the parameters (they are not zeroed here).
+        
+        Returns:
+            The summed loss over all samples, as a float.
+        """
+        total = 0.
+        for start in range(0, len(X), self.microbatch_size):
+            end = start + self.microbatch_size
+            loss = sum((self.loss_fn(self.model(x), t) for x, t in zip(X[start:end], y[start:end])), Value(0))
+            loss.backward(retain_graph=False)
+            total += loss.data
+        return total
+
+    def step(self, X, y):
+        """ One update over the batch X, y. Returns the batch loss. """
+        self.model.zero_grad()
+        loss = self.accumulate(X, y)
+        for p in self.model.parameters():
+            p.data -= self.lr * p.grad
+        return loss
+
+    def fit(self, X, y, epochs=1, batch_size=None, log_every=1):
+        """
+        Args:
+            X: List of input samples.
+            y: List of targets.
+            epochs: Number of passes over the data.
+            batch_size: Samples per update (effective batch size). Defaults to all of X.
+            log_every: Print the loss and throughput every this many epochs (0 disables it).
+        
+        Returns:
+            List with the total loss of every epoch.
+        """
+        batch_size = batch_size or len(X)
+        history = []
+        for epoch in range(epochs):
+            t0 = time.perf_counter()
+            loss = sum(self.step(X[i:i+batch_size], y[i:i+batch_size]) for i in range(0, len(X), batch_size))
+            elapsed = time.perf_counter() - t0
+            history.append(loss)
+            if log_every and epoch % log_every == 0:
+                print(f"Epoch {epoch}, Loss: {loss:.4f}, {len(X) / elapsed:.0f} samples/s")
+        return history
+
+    def __repr__(self):
+        return f"Trainer({self.model}, lr={self.lr}, microbatch_size={self.microbatch_size})"
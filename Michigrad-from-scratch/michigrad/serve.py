@@ -0,0 +1,245 @@
+import asyncio
+import json
+import math
+import numbers
+import time
+from collections import deque
+
+from michigrad.nn import FrozenModule
+
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile of a list of numbers.
+
+    Args:
+        values: List of numbers.
+        q: Percentile, between 0 and 100.
+    """
+    if not values:
+        return 0.
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class BatchingServer:
+    """
+    Local inference server with dynamic batching.
+
+    Incoming requests are queued and coalesced into batches of at most `max_batch_size`
+    samples, waiting at most `max_wait_ms` for a batch to fill. Each batch runs through
+    the frozen (graph-free) version of the model and the results are sent back to
+    each request.
+
+    Requests can come from `predict()` or over HTTP (see `listen()`):
+        POST /predict  {"x": [0.5, 1.0]}  ->  {"y": 0.73}
+        GET  /metrics                     ->  latency percentiles, queue depth, ...
+    """
+
+    def __init__(self, model, max_batch_size=64, max_wait_ms=2., history=10000):
+        """
+        Args:
+            model: Trained michigrad.nn module (it is frozen here) or a FrozenModule.
+            max_batch_size: Maximum number of requests in a batch.
+            max_wait_ms: Maximum time the first request of a batch waits for others.
+            history: Number of recent requests kept for the latency metrics.
+        """
+        self.model = model if isinstance(model, FrozenModule) else model.freeze()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.latencies = deque(maxlen=history)  # seconds, from enqueue to result
+        self.requests = 0
+        self.batches = 0
+        self._queue = None
+        self._worker = None
+
+    async def start(self):
+        """ Starts the batching loop on the running event loop. """
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        """ Stops the batching loop. Requests still waiting fail with a RuntimeError. """
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            _fail(future, RuntimeError("server stopped"))
+
+    async def predict(self, x):
+        """
+        Queues one sample and waits for its prediction (a float, or a list for multiple outputs).
+
+        Raises:
+            ValueError: If x is not a flat list with one number per model input.
+        """
+        self._check_input(x)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((x, future, time.perf_counter()))
+        return await future
+
+    def _check_input(self, x):
+        if not isinstance(x, (list, tuple)) or not all(
+                isinstance(xi, numbers.Real) and not isinstance(xi, bool) for xi in x):
+            raise ValueError("x must be a flat list of numbers")
+        if not all(math.isfinite(xi) for xi in x):
+            raise ValueError("x must only contain finite numbers (no NaN or inf)")
+        if self.model.nin is not None and len(x) != self.model.nin:
+            raise ValueError(f"x must have {self.model.nin} values, got {len(x)}")
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                for _, future, _ in batch:
+                    _fail(future, RuntimeError("server stopped"))
+                raise
+            try:
+                self._run(batch)
+            except Exception as e:
+                # Never let the worker die: that would leave every request waiting forever
+                for _, future, _ in batch:
+                    _fail(future, e)
+
+    def _run(self, batch):
+        try:
+            results = [(pred.tolist(), None) for pred in self.model.predict_batch([x for x, _, _ in batch])]
+        except Exception:
+            # A bad sample breaks the whole batch: run them one by one so only it fails
+            results = [self._run_one(x) for x, _, _ in batch]
+
+        now = time.perf_counter()
+        for (_, future, t0), (pred, error) in zip(batch, results):
+            if future.done():  # the client went away
+                continue
+            if error is None:
+                future.set_result(pred)
+            else:
+                future.set_exception(error)
+            self.latencies.append(now - t0)
+        self.requests += len(batch)
+        self.batches += 1
+
+    def _run_one(self, x):
+        try:
+            return self.model(x).tolist(), None
+        except Exception as e:
+            return None, e
+
+    def metrics(self):
+        latencies = list(self.latencies)
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.,
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'latency_ms': {f'p{q}': percentile(latencies, q) * 1000 for q in (50, 90, 99)},
+        }
+
+    # --- HTTP ---
+
+    async def listen(self, host='127.0.0.1', port=8000, path=None):
+        """
+        Starts the batching loop and an HTTP server on host:port, or on a Unix socket if `path` is given.
+
+        Returns:
+            The asyncio Server (use `port=0` and its `sockets` to get a free port).
+        """
+        await self.start()
+        if path:
+            return await asyncio.start_unix_server(self._handle, path=path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(' ', 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode().partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self._route(method, target, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(_http_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, target, body):
+        if method == 'GET' and target == '/metrics':
+            return 200, self.metrics()
+        if method == 'POST' and target == '/predict':
+            try:
+                x = json.loads(body)['x']
+                return 200, {'y': await self.predict(x)}
+            except (ValueError, KeyError, TypeError) as e:
+                return 400, {'error': str(e)}
+            except RuntimeError as e:
+                return 503, {'error': str(e)}
+            except Exception as e:
+                # Any other error raised by the model while running the batch
+                return 500, {'error': f'{type(e).__name__}: {e}'}
+        return 404, {'error': f'{method} {target} not found'}
+
+
+def _fail(future, error):
+    if not future.done():
+        future.set_exception(error)
+
+
+def _http_response(status, payload, keep_alive):
+    reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+               500: 'Internal Server Error', 503: 'Service Unavailable'}
+    try:
+        body = json.dumps(payload, allow_nan=False).encode()
+    except ValueError:
+        # NaN/inf are not valid JSON (e.g. a prediction that overflowed)
+        status, body = 500, json.dumps({'error': 'non-finite value in the response'}).encode()
+    head = (f"HTTP/1.1 {status} {reasons[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+def serve(model, host='127.0.0.1', port=8000, path=None, **kwargs):
+    """
+    Serves a model until interrupted (blocking).
+
+    Args:
+        model: Trained michigrad.nn module.
+        host, port: Address to listen on (localhost by default).
+        path: Unix socket path, used instead of host/port if given.
+        **kwargs: Batching options for BatchingServer (max_batch_size, max_wait_ms).
+    """
+    async def main():
+        server = BatchingServer(model, **kwargs)
+        http = await server.listen(host, port, path)
+        print(f"Serving {server.model} on {path or f'http://{host}:{port}'}")
+        async with http:
+            await http.serve_forever()
+
+    asyncio.run(main())
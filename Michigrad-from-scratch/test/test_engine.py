@@ -16,7 +16,7 @@ def test_sanity_check():
     Compares the results (forward pass and gradients) of a small computational graph
     against PyTorch's autograd engine to ensure numerical accuracy.
     """
-    x = Value(-4.0)
+    x = Value(-4.0, requires_grad=True)
     z = 2 * x + 2 + x
     q = z.relu() + z * x
     h = (z * z).relu()
@@ -45,8 +45,8 @@ def test_advanced_activations():
     tol = 1e-6
 
     # --- Test Sigmoid and Exponential functions ---
-    a = Value(-1.5)
-    b = Value(0.8)
+    a = Value(-1.5, requires_grad=True)
+    b = Value(0.8, requires_grad=True)
     # f = sigmoid(a) + exp(b)
     f = a.sigmoid() + b.exp()
     f.backward()
@@ -61,8 +61,8 @@ def test_advanced_activations():
     assert abs(b.grad - b_pt.grad.item()) < tol
 
     # --- Test Power function with Variable Exponent (Value ** Value) ---
-    x = Value(2.0)
-    y = Value(3.0)
+    x = Value(2.0, requires_grad=True)
+    y = Value(3.0, requires_grad=True)
     g = x ** y  # 2^3
     g.backward()
 
@@ -88,8 +88,8 @@ def test_more_ops():
     a_val, b_val = -4.0, 2.0
     
     # Michigrad version
-    a = Value(a_val)
-    b = Value(b_val)
+    a = Value(a_val, requires_grad=True)
+    b = Value(b_val, requires_grad=True)
     c = a + b
     d = a * b + b**3
     c += c + 1
@@ -131,8 +131,60 @@ def test_more_ops():
     assert abs(amg.grad - apt.grad.item()) < tol
     assert abs(bmg.grad - bpt.grad.item()) < tol
 
+def test_requires_grad_pruning():
+    """
+    Verifies that only the subgraph leading to requires_grad leaves is backpropagated.
+    
+    Inputs and auto-wrapped constants must not get gradient rules or gradients,
+    while the parameters must get the same gradients as before.
+    """
+    w = Value(-3.0, requires_grad=True)
+    x = Value(2.0)
+    const = x * 5 + 1  # built only from non-grad values
+    out = (w * const).relu() + w**2 + w * x
+    out.backward()
+
+    assert not x.requires_grad and not const.requires_grad
+    assert out.requires_grad
+    assert const._backward.__name__ == '<lambda>'  # no gradient rule attached
+    assert const.grad == 0 and x.grad == 0
+    # d/dw [relu(11w) + w^2 + w*x] at w=-3, x=2 -> 0 + 2w + x
+    assert w.grad == -4.0
+
+
+def test_backward_release_graph():
+    """
+    Verifies that backward(retain_graph=False) keeps the gradients but drops the graph.
+    """
+    w = Value(3.0, requires_grad=True)
+    loss = (w * 2 + 1)**2
+    loss.backward(retain_graph=False)
+    assert w.grad == 2 * (3.0 * 2 + 1) * 2
+    assert not loss._prev
+
+
+def test_backward_without_requires_grad():
+    """
+    Verifies that backward() raises a clear error, instead of silently leaving every
+    gradient at 0, when no leaf of the graph was created with requires_grad=True.
+    """
+    a = Value(2.0)
+    b = Value(-3.0)
+    L = (a * b + 10.0) * 2.0
+    try:
+        L.backward()
+    except RuntimeError as e:
+        assert "requires_grad=True" in str(e)
+    else:
+        assert False, "backward() on a graph without requires_grad leaves should raise"
+    assert a.grad == 0 and b.grad == 0
+
+
 if __name__ == "__main__":
     test_sanity_check()
     test_advanced_activations()
     test_more_ops()
+    test_requires_grad_pruning()
+    test_backward_release_graph()
+    test_backward_without_requires_grad()
     print("All tests (including sigmoid, exp, and pow) passed successfully.")
\ No newline at end of file
@@ -0,0 +1,106 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+import numpy as np
+from michigrad.engine import Value
+from michigrad.nn import Sequential, Linear, Neuron, ReLU, Tanh, Sigmoid, MLP, Trainer
+
+
+def test_freeze_matches_graph():
+    """
+    Verifies that frozen models give the same outputs as the Value graph forward pass.
+    
+    Covers every layer type that can be frozen, with single and multiple outputs.
+    """
+    random.seed(0)
+    models = [
+        Sequential([Linear(3, 5, nonlin=False), ReLU(), Linear(5, 4, nonlin=False), Tanh(), Linear(4, 1, nonlin=False), Sigmoid()]),
+        Sequential([Linear(3, 4, bias=False), Linear(4, 2, nonlin=False), Sigmoid()]),
+        MLP(3, [4, 4, 2]),
+        Neuron(3),
+    ]
+    X = [[random.uniform(-2, 2) for _ in range(3)] for _ in range(20)]
+
+    for model in models:
+        frozen = model.freeze()
+        preds = frozen.predict_batch(X)
+        for x, pred in zip(X, preds):
+            out = model([Value(xi) for xi in x])
+            expected = [o.data for o in out] if isinstance(out, list) else out.data
+            assert np.allclose(pred, expected, atol=1e-12)
+
+
+def test_freeze_is_a_snapshot():
+    """
+    Verifies that the frozen copy doesn't follow later updates of the parameters,
+    and that large batches run fast without building any graph.
+    """
+    random.seed(1)
+    model = MLP(2, [8, 1])
+    frozen = model.freeze()
+    X = np.random.default_rng(0).uniform(-1, 1, size=(100_000, 2))
+    before = frozen.predict_batch(X)
+
+    for p in model.parameters():
+        p.data += 1.0
+    assert np.array_equal(frozen.predict_batch(X), before)
+
+    t0 = time.perf_counter()
+    frozen.predict_batch(X)
+    assert time.perf_counter() - t0 < 1.0
+
+
+def test_freeze_rejects_bad_shapes():
+    """
+    Verifies that predict_batch raises a clear ValueError for inputs that are not
+    a (N, nin) batch, instead of failing somewhere inside the NumPy ops.
+    """
+    frozen = MLP(2, [4, 1]).freeze()
+    for X in ([0.5, 1.0], [[0.5, 1.0, 2.0]], [[[1, 2], [3, 4]]]):
+        try:
+            frozen.predict_batch(X)
+        except ValueError:
+            continue
+        assert False, f"no error for {X}"
+
+
+def test_trainer_matches_single_graph():
+    """
+    Verifies that accumulating gradients over microbatches gives the same gradients
+    (and the same update) as backpropagating a single graph over the whole batch.
+    """
+    random.seed(2)
+    X = [[random.uniform(-1, 1) for _ in range(3)] for _ in range(10)]
+    y = [random.uniform(0, 1) for _ in range(10)]
+    loss_fn = lambda pred, gt: (pred - gt)**2
+
+    random.seed(3)
+    model = Sequential([Linear(3, 4, nonlin=False), ReLU(), Linear(4, 1, nonlin=False), Sigmoid()])
+    random.seed(3)
+    reference = Sequential([Linear(3, 4, nonlin=False), ReLU(), Linear(4, 1, nonlin=False), Sigmoid()])
+
+    total_loss = sum((loss_fn(reference(x), gt) for x, gt in zip(X, y)), Value(0))
+    reference.zero_grad()
+    total_loss.backward()
+
+    trainer = Trainer(model, loss_fn, lr=0.5, microbatch_size=3)
+    model.zero_grad()
+    loss = trainer.accumulate(X, y)
+    assert abs(loss - total_loss.data) < 1e-12
+    for p, ref in zip(model.parameters(), reference.parameters()):
+        assert abs(p.grad - ref.grad) < 1e-12
+
+    trainer.step(X, y)
+    for p, ref in zip(model.parameters(), reference.parameters()):
+        assert abs(p.data - (ref.data - 0.5 * ref.grad)) < 1e-12
+
+
+if __name__ == "__main__":
+    test_freeze_matches_graph()
+    test_freeze_is_a_snapshot()
+    test_freeze_rejects_bad_shapes()
+    test_trainer_matches_single_graph()
+    print("All nn tests passed successfully.")
@@ -0,0 +1,128 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import json
+import random
+import numpy as np
+from michigrad.nn import MLP
+from michigrad.serve import BatchingServer, _http_response
+
+
+def test_batched_predictions():
+    """
+    Verifies that concurrent requests are coalesced into batches and that every
+    request gets back its own prediction, while a malformed one is rejected.
+    """
+    random.seed(0)
+    model = MLP(3, [4, 2])
+    X = [[random.uniform(-1, 1) for _ in range(3)] for _ in range(20)]
+
+    async def main():
+        server = BatchingServer(model, max_batch_size=8, max_wait_ms=50)
+        await server.start()
+        results = await asyncio.gather(*(server.predict(x) for x in X), server.predict([1.0]), return_exceptions=True)
+        await server.stop()
+        return results, server.metrics()
+
+    results, metrics = asyncio.run(main())
+    assert np.allclose(results[:-1], model.freeze().predict_batch(X))
+    assert isinstance(results[-1], ValueError)
+    assert metrics['requests'] == 20 and metrics['batches'] == 3
+    assert metrics['queue_depth'] == 0
+
+
+def test_server_survives_bad_requests():
+    """
+    Verifies that malformed requests and errors inside the model fail only their own
+    requests: the batching loop keeps running and later valid requests are answered.
+    Requests still queued when the server stops fail instead of waiting forever.
+    """
+    random.seed(2)
+    model = MLP(1, [4, 1])
+    expected = model([0.5]).data
+
+    async def main():
+        server = BatchingServer(model, max_wait_ms=1)
+        await server.start()
+        for bad in (0.5, [[0.5]], [0.5, 1.0], ['a'], None, [float('nan')], [float('inf')]):
+            try:
+                await server.predict(bad)
+            except ValueError:
+                continue
+            assert False, f"no error for {bad}"
+        assert abs(await asyncio.wait_for(server.predict([0.5]), 1) - expected) < 1e-12
+
+        # An unexpected error while running a batch
+        forward = server.model._forward
+        server.model._forward = lambda X: X[5]
+        failed = await asyncio.gather(server.predict([0.5]), return_exceptions=True)
+        assert isinstance(failed[0], IndexError)
+        server.model._forward = forward
+        assert abs(await asyncio.wait_for(server.predict([0.5]), 1) - expected) < 1e-12
+
+        # Stopping with requests still in the queue
+        pending = asyncio.gather(*(server.predict([0.5]) for _ in range(3)), return_exceptions=True)
+        await asyncio.sleep(0)
+        await server.stop()
+        return await asyncio.wait_for(pending, 1)
+
+    stopped = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in stopped)
+
+
+def test_http_endpoint():
+    """
+    Verifies the HTTP endpoints: /predict returns the model output and /metrics the server stats.
+    """
+    random.seed(1)
+    model = MLP(2, [4, 1])
+
+    async def call(port, raw):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(raw)
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        return head.split(b' ')[1], json.loads(body)
+
+    async def main():
+        server = BatchingServer(model)
+        http = await server.listen(port=0)
+        port = http.sockets[0].getsockname()[1]
+        body = json.dumps({'x': [0.5, -1.0]}).encode()
+        prediction = await call(port, b"POST /predict HTTP/1.1\r\nConnection: close\r\n"
+                                      b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        bad = await call(port, b"POST /predict HTTP/1.1\r\nConnection: close\r\nContent-Length: 2\r\n\r\n{}")
+        scalar = await call(port, b"POST /predict HTTP/1.1\r\nConnection: close\r\nContent-Length: 10\r\n\r\n{\"x\": 0.5}")
+        nan = await call(port, b"POST /predict HTTP/1.1\r\nConnection: close\r\nContent-Length: 17\r\n\r\n{\"x\": [NaN, 1.0]}")
+        # An unexpected error inside the model is a 500, and the server keeps answering
+        forward = server.model._forward
+        server.model._forward = lambda X: X[5]
+        crash = await call(port, b"POST /predict HTTP/1.1\r\nConnection: close\r\n"
+                                 b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        server.model._forward = forward
+        valid = await call(port, b"POST /predict HTTP/1.1\r\nConnection: close\r\n"
+                                 b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        metrics = await call(port, b"GET /metrics HTTP/1.1\r\nConnection: close\r\n\r\n")
+        http.close()
+        await server.stop()
+        return prediction, bad, scalar, nan, crash, valid, metrics
+
+    prediction, bad, scalar, nan, crash, valid, metrics = asyncio.run(main())
+    assert prediction[0] == b'200'
+    assert abs(prediction[1]['y'] - model([0.5, -1.0]).data) < 1e-12
+    assert bad[0] == b'400' and scalar[0] == b'400' and nan[0] == b'400'
+    assert crash[0] == b'500' and 'IndexError' in crash[1]['error']
+    assert valid == prediction
+    assert metrics[0] == b'200' and metrics[1]['requests'] == 3
+    # A prediction that overflowed can't be sent as JSON
+    assert _http_response(200, {'y': float('inf')}, False).startswith(b'HTTP/1.1 500')
+
+
+if __name__ == "__main__":
+    test_batched_predictions()
+    test_server_survives_bad_requests()
+    test_http_endpoint()
+    print("All serve tests passed successfully.")